@@ -12,8 +12,8 @@ bl_info = {
 
 import bpy
 import gpu
+import numpy as np
 from gpu_extras.batch import batch_for_shader
-from bpy_extras.view3d_utils import region_2d_to_origin_3d, region_2d_to_vector_3d
 from bpy.props import (
     PointerProperty,
     FloatProperty,
@@ -23,6 +23,44 @@ from bpy.props import (
 )
 from bpy.types import PropertyGroup
 
+# --- Property Update Callbacks ---
+# Color and pattern tweaks are written straight into the existing material, so
+# only height/subdivision changes need another run of AURORA_OT_Create
+def get_aurora_node(context, node_name):
+    """Return a node of the active curve's aurora material, or None"""
+    curve_object = context.active_object
+    if curve_object is None or "aurora_material_name" not in curve_object:
+        return None
+    mat = bpy.data.materials.get(curve_object["aurora_material_name"])
+    if mat is None or mat.node_tree is None:
+        return None
+    return mat.node_tree.nodes.get(node_name)
+
+def update_color1(self, context):
+    node = get_aurora_node(context, 'color_ramp_main')
+    if node:
+        node.color_ramp.elements[0].color = self.color1
+
+def update_color2(self, context):
+    node = get_aurora_node(context, 'color_ramp_main')
+    if node:
+        node.color_ramp.elements[1].color = self.color2
+
+def update_emission_strength(self, context):
+    node = get_aurora_node(context, 'multiply_emission')
+    if node:
+        node.inputs[1].default_value = self.emission_strength
+
+def update_noise_scale(self, context):
+    node = get_aurora_node(context, 'noise_tex')
+    if node:
+        node.inputs['Scale'].default_value = self.noise_scale
+
+def update_noise_distortion(self, context):
+    node = get_aurora_node(context, 'noise_tex')
+    if node:
+        node.inputs['Distortion'].default_value = self.noise_distortion
+
 # --- Properties ---
 class AuroraGeneratorProperties(PropertyGroup):
     aurora_height: FloatProperty(
@@ -46,7 +84,8 @@ class AuroraGeneratorProperties(PropertyGroup):
         default=(0.1, 1.0, 0.7, 1.0), # Default bright green/cyan
         min=0.0,
         max=1.0,
-        size=4
+        size=4,
+        update=update_color1
     )
     
     color2: FloatVectorProperty(
@@ -55,28 +94,32 @@ class AuroraGeneratorProperties(PropertyGroup):
         default=(0.3, 0.2, 0.8, 1.0), # Default soft purple
         min=0.0,
         max=1.0,
-        size=4
+        size=4,
+        update=update_color2
     )
     
     emission_strength: FloatProperty(
         name="Emission Strength",
         description="How bright the aurora glows",
         default=25.0,
-        min=0.0
+        min=0.0,
+        update=update_emission_strength
     )
     
     noise_scale: FloatProperty(
         name="Wispy Scale",
         description="Scale of the wispy noise pattern",
         default=1.5,
-        min=0.1
+        min=0.1,
+        update=update_noise_scale
     )
     
     noise_distortion: FloatProperty(
         name="Wispy Distortion",
         description="Distortion of the wispy noise pattern",
         default=0.5,
-        min=0.0
+        min=0.0,
+        update=update_noise_distortion
     )
 
     animate: BoolProperty(
@@ -86,24 +129,71 @@ class AuroraGeneratorProperties(PropertyGroup):
     )
 
 
+# Enum value of 'ALIGNED' Bezier handles, for foreach_set. Verified in register().
+_ALIGNED_HANDLE = 3
+
 # --- Draw Callback for Modal Operator ---
+# Created on first draw: the GPU module can't be used before a draw context exists
+_UNIFORM_COLOR_SHADER = None
+
+def get_uniform_color_shader():
+    global _UNIFORM_COLOR_SHADER
+    if _UNIFORM_COLOR_SHADER is None:
+        _UNIFORM_COLOR_SHADER = gpu.shader.from_builtin('UNIFORM_COLOR')
+    return _UNIFORM_COLOR_SHADER
+
+# Cubic Bernstein weights at fixed sample positions, shape (4, samples), so every
+# segment of the path preview is evaluated with a single matmul
+_PREVIEW_SAMPLES = 16
+_T = np.linspace(0.0, 1.0, _PREVIEW_SAMPLES, dtype=np.float32)
+_BERNSTEIN = np.stack((
+    (1 - _T) ** 3,
+    3 * (1 - _T) ** 2 * _T,
+    3 * (1 - _T) * _T ** 2,
+    _T ** 3,
+))
+
+def sample_bezier_spline(spline):
+    """Return evenly sampled points along a Bezier spline as a (N, 3) float32 array"""
+    bezier_points = spline.bezier_points
+    num_points = len(bezier_points)
+    co = np.empty(num_points * 3, dtype=np.float32)
+    left = np.empty(num_points * 3, dtype=np.float32)
+    right = np.empty(num_points * 3, dtype=np.float32)
+    bezier_points.foreach_get('co', co)
+    bezier_points.foreach_get('handle_left', left)
+    bezier_points.foreach_get('handle_right', right)
+    co, left, right = co.reshape(-1, 3), left.reshape(-1, 3), right.reshape(-1, 3)
+
+    # (segments, 4 control points, xyz)
+    control = np.stack((co[:-1], right[:-1], left[1:], co[1:]), axis=1)
+    return np.einsum('sij,ik->skj', control, _BERNSTEIN).reshape(-1, 3)
+
 def draw_callback_px(self, context):
-    if not self.points:
+    if not len(self.points):
         return
 
-    shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+    shader = get_uniform_color_shader()
+
+    # Only re-upload the points to the GPU when the operator added one
+    if self._batches_dirty:
+        self._line_batch = None
+        if len(self.points) > 1:
+            samples = sample_bezier_spline(self.curve_ob.data.splines[0])
+            self._line_batch = batch_for_shader(shader, 'LINE_STRIP', {"pos": samples})
+        self._point_batch = batch_for_shader(shader, 'POINTS', {"pos": self.points})
+        self._batches_dirty = False
+
+    shader.bind()
     # Draw lines
-    if len(self.points) > 1:
-        batch = batch_for_shader(shader, 'LINE_STRIP', {"pos": self.points})
-        shader.bind()
+    if self._line_batch:
         shader.uniform_float("color", (0.8, 0.8, 0.8, 1.0))
-        batch.draw(shader)
+        self._line_batch.draw(shader)
     # Draw points
-    batch = batch_for_shader(shader, 'POINTS', {"pos": self.points})
-    shader.bind()
     shader.uniform_float("color", (0.2, 0.5, 1.0, 1.0))
+    # GPU state is reset between draw callbacks, so this has to stay per frame
     gpu.state.point_size_set(5)
-    batch.draw(shader)
+    self._point_batch.draw(shader)
 
 # --- Modal Operator to draw a curve by clicking ---
 class CURVE_OT_DrawPath(bpy.types.Operator):
@@ -115,39 +205,68 @@ class CURVE_OT_DrawPath(bpy.types.Operator):
     # REMOVED __init__ as it's better practice to initialize in invoke() for modal operators
 
     def modal(self, context, event):
-        context.area.tag_redraw()
-
+        # The viewport is only redrawn when something changed, not for every
+        # mouse move that passes through
         if event.type in {'RIGHTMOUSE', 'RET'}:
             self.finish(context)
+            context.area.tag_redraw()
             return {'FINISHED'}
 
         if event.type == 'ESC':
             self.cancel(context)
+            context.area.tag_redraw()
             return {'CANCELLED'}
 
         if event.type == 'LEFTMOUSE' and event.value == 'PRESS':
             # Get 3D location from mouse click
-            region = context.region
-            rv3d = context.region_data
-            coord = event.mouse_region_x, event.mouse_region_y
-            origin = region_2d_to_origin_3d(region, rv3d, coord)
-            vec = region_2d_to_vector_3d(region, rv3d, coord)
-            
-            # Intersect with the Z=0 plane
-            location = None
-            if vec.z != 0:
-                t = -origin.z / vec.z
-                if t > 0:
-                    location = origin + t * vec
-
-            if location:
-                self.points.append(location)
+            location = self.ground_location(context, event.mouse_region_x, event.mouse_region_y)
+
+            if location is not None:
+                self.add_point(location)
+                self._batches_dirty = True
                 self.update_curve(context)
+                context.area.tag_redraw()
             
             return {'RUNNING_MODAL'}
 
         return {'PASS_THROUGH'}
 
+    @property
+    def points(self):
+        """View of the clicked points as a (N, 3) float32 array"""
+        return self._pts[:self._n]
+
+    def add_point(self, location):
+        if self._n == len(self._pts):
+            self._pts = np.resize(self._pts, (2 * len(self._pts), 3))
+        self._pts[self._n] = location
+        self._n += 1
+
+    def ground_location(self, context, x, y):
+        region = context.region
+        rv3d = context.region_data
+
+        # The inverse projection only changes with the view, so keep it for the session
+        persp = rv3d.perspective_matrix
+        if persp != self._persp:
+            self._persp = persp.copy()
+            self._inv_persp = np.array(persp.inverted(), dtype=np.float64)
+
+        # Unproject the click onto the near and far clip planes in one matmul
+        ndc_x = 2.0 * x / region.width - 1.0
+        ndc_y = 2.0 * y / region.height - 1.0
+        clip = np.array(((ndc_x, ndc_y, -1.0, 1.0), (ndc_x, ndc_y, 1.0, 1.0)))
+        near, far = clip @ self._inv_persp.T
+        origin = near[:3] / near[3]
+        vec = far[:3] / far[3] - origin
+
+        # Intersect with the Z=0 plane
+        if abs(vec[2]) > 1e-9:
+            t = -origin[2] / vec[2]
+            if t > 0:
+                return origin + t * vec
+        return None
+
     def update_curve(self, context):
         if not self.curve_ob:
             curve_data = bpy.data.curves.new('AuroraPath', type='CURVE')
@@ -157,20 +276,43 @@ class CURVE_OT_DrawPath(bpy.types.Operator):
             context.collection.objects.link(self.curve_ob)
         
         spline = self.curve_ob.data.splines[0]
+        bezier_points = spline.bezier_points
         num_points = len(self.points)
         
-        if len(spline.bezier_points) < num_points:
-             spline.bezier_points.add(num_points - len(spline.bezier_points))
+        if len(bezier_points) < num_points:
+             bezier_points.add(num_points - len(bezier_points))
         
-        for i, point_co in enumerate(self.points):
-            spline.bezier_points[i].co = point_co
-            spline.bezier_points[i].handle_left_type = 'AUTO'
-            spline.bezier_points[i].handle_right_type = 'AUTO'
+        # Every point is rewritten on each click: adding a point changes the tangent
+        # of its neighbour, and foreach_set can only write the whole collection.
+        # That is one C-level copy per attribute, with no per-point Python work.
+        # Catmull-Rom tangents, with one-sided differences at both ends
+        points = self.points
+        tangents = np.zeros_like(points)
+        if num_points > 1:
+            tangents[1:-1] = 0.5 * (points[2:] - points[:-2])
+            tangents[0] = points[1] - points[0]
+            tangents[-1] = points[-1] - points[-2]
+        tangents /= 3.0
+
+        # The point buffer already has the flat float32 layout RNA uses, so each
+        # attribute goes in with a single copy. Handles are computed above and set
+        # ALIGNED instead of AUTO: foreach_set skips the RNA update, so Blender
+        # never runs its handle solver here, and the collinear handles stay smooth
+        # when the path is edited later.
+        handle_types = [_ALIGNED_HANDLE] * num_points
+        bezier_points.foreach_set('co', points.ravel())
+        bezier_points.foreach_set('handle_left_type', handle_types)
+        bezier_points.foreach_set('handle_right_type', handle_types)
+        bezier_points.foreach_set('handle_left', (points - tangents).ravel())
+        bezier_points.foreach_set('handle_right', (points + tangents).ravel())
+        # foreach_set doesn't send RNA updates
+        self.curve_ob.data.update_tag()
 
     def finish(self, context):
         bpy.types.SpaceView3D.draw_handler_remove(self._handle, 'WINDOW')
         if self.curve_ob:
-            bpy.ops.object.select_all(action='DESELECT')
+            for ob in list(context.view_layer.objects.selected):
+                ob.select_set(False)
             self.curve_ob.select_set(True)
             context.view_layer.objects.active = self.curve_ob
         context.window.cursor_set('DEFAULT')
@@ -186,8 +328,13 @@ class CURVE_OT_DrawPath(bpy.types.Operator):
     def invoke(self, context, event):
         if context.space_data.type == 'VIEW_3D':
             # FIXED: Initialize properties here instead of __init__
-            self.points = []
+            self._pts = np.empty((1024, 3), dtype=np.float32)
+            self._n = 0
             self.curve_ob = None
+            self._persp = None
+            self._inv_persp = None
+            self._batches_dirty = True
+            self._line_batch = self._point_batch = None
             self._handle = bpy.types.SpaceView3D.draw_handler_add(draw_callback_px, (self, context), 'WINDOW', 'POST_VIEW')
             context.window_manager.modal_handler_add(self)
             context.window.cursor_set('CROSSHAIR')
@@ -197,6 +344,73 @@ class CURVE_OT_DrawPath(bpy.types.Operator):
             self.report({'WARNING'}, "Active space must be a 3D View.")
             return {'CANCELLED'}
 
+# --- Aurora Material Layout ---
+# (name, node type, location) for every node in the aurora material
+_NODE_SPECS = (
+    ('output_node', 'ShaderNodeOutputMaterial', (600, 0)),
+    ('mix_shader', 'ShaderNodeMixShader', (400, 0)),
+    ('emission', 'ShaderNodeEmission', (200, 100)),
+    ('transparent', 'ShaderNodeBsdfTransparent', (200, -200)),
+    ('color_ramp_main', 'ShaderNodeValToRGB', (-200, 100)),
+    ('separate_xyz', 'ShaderNodeSeparateXYZ', (-400, 100)),
+    ('tex_coord', 'ShaderNodeTexCoord', (-600, 100)),
+    ('noise_tex', 'ShaderNodeTexNoise', (0, -200)),
+    ('mapping_anim', 'ShaderNodeMapping', (-400, -200)),
+    ('mapping_stretch', 'ShaderNodeMapping', (-200, -200)),
+    ('emission_falloff_ramp', 'ShaderNodeValToRGB', (-200, 200)),
+    ('multiply_emission', 'ShaderNodeMath', (0, 200)),
+    ('vertical_fade_ramp', 'ShaderNodeValToRGB', (0, 0)),
+    ('combine_fade_and_noise', 'ShaderNodeMath', (200, -50)),
+    ('displace_noise', 'ShaderNodeVectorMath', (400, -250)),
+)
+
+# (from node, output socket, to node, input socket)
+_LINK_SPECS = (
+    ('tex_coord', 'Generated', 'separate_xyz', 'Vector'),
+    ('separate_xyz', 'Y', 'color_ramp_main', 'Fac'),
+    ('color_ramp_main', 'Color', 'emission', 'Color'),
+    ('separate_xyz', 'Y', 'emission_falloff_ramp', 'Fac'),
+    ('emission_falloff_ramp', 'Color', 'multiply_emission', 0),
+    ('multiply_emission', 'Value', 'emission', 'Strength'),
+    ('tex_coord', 'Generated', 'mapping_anim', 'Vector'),
+    ('mapping_anim', 'Vector', 'mapping_stretch', 'Vector'),
+    ('mapping_stretch', 'Vector', 'noise_tex', 'Vector'),
+    ('separate_xyz', 'Y', 'vertical_fade_ramp', 'Fac'),
+    ('vertical_fade_ramp', 'Color', 'combine_fade_and_noise', 0),
+    ('noise_tex', 'Fac', 'combine_fade_and_noise', 1),
+    ('combine_fade_and_noise', 'Value', 'mix_shader', 'Fac'),
+    ('emission', 'Emission', 'mix_shader', 1),
+    ('transparent', 'BSDF', 'mix_shader', 2),
+    ('mix_shader', 'Shader', 'output_node', 'Surface'),
+    ('noise_tex', 'Fac', 'displace_noise', 0),
+    ('displace_noise', 'Vector', 'output_node', 'Displacement'),
+)
+
+# --- Aurora Mesh ---
+# (verts, faces) arrays of the last built curtain, keyed by (subdivisions, rounded height).
+# Only one shape is kept: a 1024-subdivision grid alone is about 30 MB.
+_MESH_CACHE = {}
+
+def build_aurora_mesh(subdivisions, height):
+    """Return the (verts, faces) arrays of a subdivided curtain standing in the XZ plane"""
+    # Same grid as a 2x2 plane scaled by (20, height / 2), subdivided and stood up
+    cols = subdivisions + 2
+    verts = np.zeros((cols * cols, 3), dtype=np.float32)
+    verts[:, 0] = np.tile(np.linspace(-20.0, 20.0, cols, dtype=np.float32), cols)
+    verts[:, 2] = np.repeat(np.linspace(-height / 2, height / 2, cols, dtype=np.float32), cols)
+
+    # Quads wound counter-clockwise as seen from -Y, so normals face -Y like the rotated plane
+    corner = (np.arange(cols - 1) + cols * np.arange(cols - 1)[:, None]).ravel()
+    faces = np.stack((corner, corner + 1, corner + cols + 1, corner + cols), axis=1).astype(np.int32)
+
+    # Cached and shared between runs, so make sure nobody edits them in place
+    verts.flags.writeable = False
+    faces.flags.writeable = False
+    return verts, faces
+
+# Enum value of 'LINEAR' keyframe interpolation, for foreach_set. Verified in register().
+_LINEAR_INTERPOLATION = 1
+
 # --- Operator to Create Aurora ---
 class AURORA_OT_Create(bpy.types.Operator):
     """Creates or updates an aurora mesh and material from the selected curve"""
@@ -212,50 +426,67 @@ class AURORA_OT_Create(bpy.types.Operator):
         props = context.scene.aurora_props
         curve_object = context.active_object
 
+        # The grid only depends on subdivisions and height
+        shape = (props.subdivisions, round(props.aurora_height, 4))
+
         # --- Pre-Creation Cleanup ---
-        # Decoupled cleanup to prevent orphaned data if user deletes object manually
+        # Decoupled cleanup to prevent orphaned data if user deletes object manually.
+        # An aurora with the same shape is kept as it is, only its material is updated.
+        aurora_object = None
         if "aurora_object_name" in curve_object:
             old_aurora_name = curve_object["aurora_object_name"]
             old_aurora = bpy.data.objects.get(old_aurora_name)
             if old_aurora:
-                bpy.data.objects.remove(old_aurora, do_unlink=True)
-
-        if "aurora_mesh_name" in curve_object:
-            old_mesh_name = curve_object["aurora_mesh_name"]
-            old_mesh = bpy.data.meshes.get(old_mesh_name)
-            if old_mesh and old_mesh.users == 0:
-                bpy.data.meshes.remove(old_mesh)
-
-        if "aurora_texture_name" in curve_object:
-            old_tex_name = curve_object["aurora_texture_name"]
-            old_tex = bpy.data.textures.get(old_tex_name)
-            if old_tex and old_tex.users == 0:
-                bpy.data.textures.remove(old_tex)
-        
-        # --- 1. Create the base mesh ---
-        bpy.ops.mesh.primitive_plane_add(enter_editmode=True)
-        aurora_object = context.active_object
-        aurora_object.name = "Aurora"
-        
-        bpy.ops.transform.resize(value=(20, 1, 1))
-        bpy.ops.transform.resize(value=(1, props.aurora_height / 2, 1))
-        bpy.ops.mesh.subdivide(number_cuts=props.subdivisions, smoothness=0)
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-        aurora_object.rotation_euler[0] = 1.5708
-        bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
+                follow_curve = old_aurora.modifiers.get("FollowCurve")
+                follow_target = getattr(follow_curve, "object", None)
+                if follow_target is not None and follow_target != curve_object:
+                    # The properties were copied along with a duplicated curve, and this
+                    # aurora belongs to the original one: leave it alone and build a new one
+                    pass
+                elif (old_aurora.type == 'MESH'
+                        and old_aurora.name in context.view_layer.objects
+                        and follow_target == curve_object
+                        and old_aurora.data.name == curve_object.get("aurora_mesh_name")
+                        and curve_object.get("aurora_subdivisions") == shape[0]
+                        and curve_object.get("aurora_height") == shape[1]):
+                    aurora_object = old_aurora
+                else:
+                    bpy.data.objects.remove(old_aurora, do_unlink=True)
+
+        if aurora_object is None:
+            if "aurora_mesh_name" in curve_object:
+                old_mesh_name = curve_object["aurora_mesh_name"]
+                old_mesh = bpy.data.meshes.get(old_mesh_name)
+                if old_mesh and old_mesh.users == 0:
+                    bpy.data.meshes.remove(old_mesh)
+
+            # --- 1. Create the base mesh ---
+            # Reuse the arrays of an earlier build with the same shape, if there was one
+            mesh_arrays = _MESH_CACHE.get(shape)
+            if mesh_arrays is None:
+                _MESH_CACHE.clear()
+                mesh_arrays = _MESH_CACHE[shape] = build_aurora_mesh(*shape)
+            verts, faces = mesh_arrays
+
+            mesh = bpy.data.meshes.new("Aurora")
+            mesh.vertices.add(len(verts))
+            mesh.vertices.foreach_set('co', verts.ravel())
+            mesh.loops.add(faces.size)
+            mesh.loops.foreach_set('vertex_index', faces.ravel())
+            mesh.polygons.add(len(faces))
+            mesh.polygons.foreach_set('loop_start', np.arange(0, faces.size, 4, dtype=np.int32))
+            mesh.update(calc_edges=True)
+
+            aurora_object = bpy.data.objects.new("Aurora", mesh)
+            aurora_object.location = context.scene.cursor.location
+            context.collection.objects.link(aurora_object)
+
+            # --- 2. Add Modifiers ---
+            # Displacement is done by the material (see displace_noise) rather than a
+            # Displace modifier, so the noise is evaluated on the GPU instead of per vertex on the CPU
+            curve_mod = aurora_object.modifiers.new(name="FollowCurve", type='CURVE')
+            curve_mod.object = curve_object
 
-        # --- 2. Add Modifiers ---
-        curve_mod = aurora_object.modifiers.new(name="FollowCurve", type='CURVE')
-        curve_mod.object = curve_object
-        
-        disp_mod = aurora_object.modifiers.new(name="Displacement", type='DISPLACE')
-        disp_texture = bpy.data.textures.new('AuroraDisplaceTexture', type='CLOUDS')
-        disp_texture.noise_scale = 0.5
-        disp_mod.texture = disp_texture
-        disp_mod.strength = 0.7
-        disp_mod.direction = 'Z'
-        
         # --- 3. Create or Update the Aurora Material ---
         mat = None
         if "aurora_material_name" in curve_object:
@@ -268,105 +499,112 @@ class AURORA_OT_Create(bpy.types.Operator):
 
         mat.use_nodes = True
         mat.blend_method = 'BLEND'
+        # Displacement settings moved from Cycles to Material in Blender 4.1.
+        # Before that they only exist while the Cycles add-on is enabled.
+        if hasattr(mat, "displacement_method"):
+            mat.displacement_method = 'BOTH'
+        else:
+            cycles = getattr(mat, "cycles", None)
+            if cycles is not None:
+                cycles.displacement_method = 'BOTH'
         
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
+        node_tree = mat.node_tree
+        nodes = node_tree.nodes
+        links = node_tree.links
         nodes.clear()
 
-        # Create all necessary nodes
-        output_node = nodes.new(type='ShaderNodeOutputMaterial')
-        mix_shader = nodes.new(type='ShaderNodeMixShader')
-        emission = nodes.new(type='ShaderNodeEmission')
-        transparent = nodes.new(type='ShaderNodeBsdfTransparent')
-        color_ramp_main = nodes.new(type='ShaderNodeValToRGB')
-        separate_xyz = nodes.new(type='ShaderNodeSeparateXYZ')
-        tex_coord = nodes.new(type='ShaderNodeTexCoord')
-        noise_tex = nodes.new(type='ShaderNodeTexNoise')
-        mapping_anim = nodes.new(type='ShaderNodeMapping')
-        mapping_stretch = nodes.new(type='ShaderNodeMapping')
-        
-        emission_falloff_ramp = nodes.new(type='ShaderNodeValToRGB')
-        multiply_emission = nodes.new(type='ShaderNodeMath')
+        # Create all necessary nodes from the layout table. They are named after
+        # their table entry so the property update callbacks can find them again.
+        node_map = {}
+        for name, node_type, location in _NODE_SPECS:
+            node = nodes.new(type=node_type)
+            node.name = name
+            node.location = location
+            node_map[name] = node
+
+        color_ramp_main = node_map['color_ramp_main']
+        emission_falloff_ramp = node_map['emission_falloff_ramp']
+        multiply_emission = node_map['multiply_emission']
+        vertical_fade_ramp = node_map['vertical_fade_ramp']
+        combine_fade_and_noise = node_map['combine_fade_and_noise']
+        mapping_anim = node_map['mapping_anim']
+        mapping_stretch = node_map['mapping_stretch']
+        noise_tex = node_map['noise_tex']
+        displace_noise = node_map['displace_noise']
+
         multiply_emission.operation = 'MULTIPLY'
-        
-        vertical_fade_ramp = nodes.new(type='ShaderNodeValToRGB')
-        combine_fade_and_noise = nodes.new(type='ShaderNodeMath')
         combine_fade_and_noise.operation = 'MAXIMUM'
-        
-        output_node.location = (600, 0)
-        mix_shader.location = (400, 0)
-        transparent.location = (200, -200)
-        emission.location = (200, 100)
-        multiply_emission.location = (0, 200)
-        emission_falloff_ramp.location = (-200, 200)
-        color_ramp_main.location = (-200, 100)
-        separate_xyz.location = (-400, 100)
-        tex_coord.location = (-600, 100)
-        combine_fade_and_noise.location = (200, -50)
-        vertical_fade_ramp.location = (0, 0)
-        noise_tex.location = (0, -200)
-        mapping_stretch.location = (-200, -200)
-        mapping_anim.location = (-400, -200)
+        displace_noise.operation = 'MULTIPLY_ADD'
 
         # --- Configure node properties ---
-        color_ramp_main.color_ramp.elements[0].color = props.color1
-        color_ramp_main.color_ramp.elements[1].color = props.color2
-
-        emission_falloff_ramp.color_ramp.elements[0].position = 0.0
-        emission_falloff_ramp.color_ramp.elements[0].color = (1, 1, 1, 1)
-        emission_falloff_ramp.color_ramp.elements[1].position = 1.0
-        emission_falloff_ramp.color_ramp.elements[1].color = (0, 0, 0, 1)
+        main_els = color_ramp_main.color_ramp.elements
+        main_els[0].color = props.color1
+        main_els[1].color = props.color2
+
+        falloff_els = emission_falloff_ramp.color_ramp.elements
+        falloff_els[0].position = 0.0
+        falloff_els[0].color = (1, 1, 1, 1)
+        falloff_els[1].position = 1.0
+        falloff_els[1].color = (0, 0, 0, 1)
         multiply_emission.inputs[1].default_value = props.emission_strength
 
-        vertical_fade_ramp.color_ramp.elements[0].position = 0.0
-        vertical_fade_ramp.color_ramp.elements[0].color = (1, 1, 1, 1)
-        vertical_fade_ramp.color_ramp.elements.new(0.3)
-        vertical_fade_ramp.color_ramp.elements[1].color = (0, 0, 0, 1)
-        vertical_fade_ramp.color_ramp.elements[2].position = 1.0
-        vertical_fade_ramp.color_ramp.elements[2].color = (0, 0, 0, 1)
-
-        mapping_stretch.inputs['Scale'].default_value[0] = 0.2
-        mapping_stretch.inputs['Scale'].default_value[1] = 10.0
-        noise_tex.inputs['Scale'].default_value = props.noise_scale
-        noise_tex.inputs['Detail'].default_value = 5.0
-        noise_tex.inputs['Roughness'].default_value = 0.6
-        noise_tex.inputs['Distortion'].default_value = props.noise_distortion
+        fade_els = vertical_fade_ramp.color_ramp.elements
+        fade_els[0].position = 0.0
+        fade_els[0].color = (1, 1, 1, 1)
+        fade_els.new(0.3)
+        fade_els[1].color = (0, 0, 0, 1)
+        fade_els[2].position = 1.0
+        fade_els[2].color = (0, 0, 0, 1)
+
+        stretch_scale = mapping_stretch.inputs['Scale'].default_value
+        stretch_scale[0] = 0.2
+        stretch_scale[1] = 10.0
+        noise_inputs = noise_tex.inputs
+        noise_inputs['Scale'].default_value = props.noise_scale
+        noise_inputs['Detail'].default_value = 5.0
+        noise_inputs['Roughness'].default_value = 0.6
+        noise_inputs['Distortion'].default_value = props.noise_distortion
+
+        # Vertical offset of (noise - 0.5) * 0.7, like the old Displace modifier
+        displace_inputs = displace_noise.inputs
+        displace_inputs[1].default_value = (0.0, 0.0, 0.7)
+        displace_inputs[2].default_value = (0.0, 0.0, -0.35)
 
         # --- 4. Link Nodes Together ---
-        links.new(tex_coord.outputs['Generated'], separate_xyz.inputs['Vector'])
-        links.new(separate_xyz.outputs['Y'], color_ramp_main.inputs['Fac'])
-        links.new(color_ramp_main.outputs['Color'], emission.inputs['Color'])
-        links.new(separate_xyz.outputs['Y'], emission_falloff_ramp.inputs['Fac'])
-        links.new(emission_falloff_ramp.outputs['Color'], multiply_emission.inputs[0])
-        links.new(multiply_emission.outputs['Value'], emission.inputs['Strength'])
-        links.new(tex_coord.outputs['Generated'], mapping_anim.inputs['Vector'])
-        links.new(mapping_anim.outputs['Vector'], mapping_stretch.inputs['Vector'])
-        links.new(mapping_stretch.outputs['Vector'], noise_tex.inputs['Vector'])
-        links.new(separate_xyz.outputs['Y'], vertical_fade_ramp.inputs['Fac'])
-        links.new(vertical_fade_ramp.outputs['Color'], combine_fade_and_noise.inputs[0])
-        links.new(noise_tex.outputs['Fac'], combine_fade_and_noise.inputs[1])
-        links.new(combine_fade_and_noise.outputs['Value'], mix_shader.inputs['Fac'])
-        links.new(emission.outputs['Emission'], mix_shader.inputs[1])
-        links.new(transparent.outputs['BSDF'], mix_shader.inputs[2])
-        links.new(mix_shader.outputs['Shader'], output_node.inputs['Surface'])
+        for from_name, from_socket, to_name, to_socket in _LINK_SPECS:
+            links.new(node_map[from_name].outputs[from_socket], node_map[to_name].inputs[to_socket])
         
         # --- 5. Add animation driver ---
         if props.animate:
-            mapping_anim.inputs['Location'].keyframe_insert(data_path='default_value', frame=1)
-            mapping_anim.inputs['Location'].default_value[1] = 5.0
-            mapping_anim.inputs['Location'].keyframe_insert(data_path='default_value', frame=250)
-            if mat.node_tree.animation_data and mat.node_tree.animation_data.action:
-                for fcurve in mat.node_tree.animation_data.action.fcurves:
-                     if fcurve.data_path.endswith("['Location']"):
-                        for k in fcurve.keyframe_points:
-                            k.interpolation = 'LINEAR'
-                        mod = fcurve.modifiers.new('CYCLES')
+            anim_location = mapping_anim.inputs['Location']
+            data_path = anim_location.path_from_id('default_value')
+            animation_data = node_tree.animation_data
+            action = animation_data.action if animation_data else None
+            y_fcurve = action.fcurves.find(data_path, index=1) if action else None
+
+            if y_fcurve and len(y_fcurve.keyframe_points) == 2:
+                # Already animated by a previous run, just reset the two keys
+                y_fcurve.keyframe_points[0].co = (1, 0.0)
+                y_fcurve.keyframe_points[1].co = (250, 5.0)
+            else:
+                anim_location.keyframe_insert(data_path='default_value', frame=1)
+                anim_location.default_value[1] = 5.0
+                anim_location.keyframe_insert(data_path='default_value', frame=250)
+                action = node_tree.animation_data.action
+
+            for fcurve in action.fcurves:
+                if fcurve.data_path == data_path:
+                    keyframe_points = fcurve.keyframe_points
+                    keyframe_points.foreach_set('interpolation', [_LINEAR_INTERPOLATION] * len(keyframe_points))
+                    if not any(m.type == 'CYCLES' for m in fcurve.modifiers):
+                        fcurve.modifiers.new('CYCLES')
 
         # --- 6. Assign material and finalize ---
-        aurora_object.data.materials.append(mat)
+        if mat.name not in aurora_object.data.materials:
+            aurora_object.data.materials.append(mat)
         curve_object["aurora_object_name"] = aurora_object.name
         curve_object["aurora_mesh_name"] = aurora_object.data.name # Store mesh name
-        curve_object["aurora_texture_name"] = disp_texture.name
+        curve_object["aurora_subdivisions"], curve_object["aurora_height"] = shape
         
         curve_object.select_set(False)
         aurora_object.select_set(True)
@@ -433,11 +671,16 @@ classes = (
 )
 
 def register():
+    global _LINEAR_INTERPOLATION, _ALIGNED_HANDLE
+    _LINEAR_INTERPOLATION = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
+    _ALIGNED_HANDLE = bpy.types.BezierSplinePoint.bl_rna.properties['handle_left_type'].enum_items['ALIGNED'].value
+
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.aurora_props = PointerProperty(type=AuroraGeneratorProperties)
 
 def unregister():
+    _MESH_CACHE.clear()
     del bpy.types.Scene.aurora_props
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)